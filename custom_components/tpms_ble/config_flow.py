@@ -20,6 +20,11 @@ from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+_MAC_RE = re.compile(r"^[0-9A-F]{12}$")
+_MAC_STRIP = str.maketrans("", "", ":- ")
+_MAC_VALIDATOR = vol.All(str, vol.Length(min=12, max=17))
+_EMPTY_SCHEMA = vol.Schema({vol.Required(CONF_MAC): _MAC_VALIDATOR})
+
 
 class TPMSConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for TPMS."""
@@ -74,20 +79,15 @@ class TPMSConfigFlow(ConfigFlow, domain=DOMAIN):
                 title = self._discovered_devices[address]
             elif CONF_MAC in user_input:
                 # Normalize MAC address format
-                mac_input = user_input[CONF_MAC].strip().upper()
                 # Handle different separators: AA:BB:CC:DD:EE:FF, AA-BB-CC-DD-EE-FF, AABBCCDDEEFF
-                mac_input = mac_input.replace("-", ":").replace(" ", "")
-                if len(mac_input) == 12 and ":" not in mac_input:
-                    # Convert AABBCCDDEEFF to AA:BB:CC:DD:EE:FF
-                    address = ":".join([mac_input[i:i+2] for i in range(0, 12, 2)])
-                else:
-                    address = mac_input
-                    
+                mac_hex = user_input[CONF_MAC].strip().upper().translate(_MAC_STRIP)
+
                 # Validate MAC address format
-                if not re.match(r'^([0-9A-F]{2}[:]){5}([0-9A-F]{2})$', address):
+                if not _MAC_RE.match(mac_hex):
                     _LOGGER.error("Invalid MAC address format: %s", user_input[CONF_MAC])
                     return self.async_abort(reason="invalid_mac_format")
-                    
+
+                address = f"{mac_hex[0:2]}:{mac_hex[2:4]}:{mac_hex[4:6]}:{mac_hex[6:8]}:{mac_hex[8:10]}:{mac_hex[10:12]}"
                 title = f"TPMS {address[-5:].replace(':', '')}"
             else:
                 return self.async_abort(reason="invalid_input")
@@ -111,19 +111,20 @@ class TPMSConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.info("Discovered TPMS device: %s (%s)", address, device_name)
 
         # Create schema with discovered devices and manual MAC entry option
-        schema_dict = {}
-        if self._discovered_devices:
-            schema_dict[vol.Optional(CONF_ADDRESS)] = vol.In(self._discovered_devices)
-        
-        schema_dict[vol.Optional(CONF_MAC)] = vol.All(str, vol.Length(min=12, max=17))
-
         # If no devices found, require manual entry
-        if not self._discovered_devices:
-            schema_dict = {vol.Required(CONF_MAC): vol.All(str, vol.Length(min=12, max=17))}
+        if self._discovered_devices:
+            data_schema = vol.Schema(
+                {
+                    vol.Optional(CONF_ADDRESS): vol.In(self._discovered_devices),
+                    vol.Optional(CONF_MAC): _MAC_VALIDATOR,
+                }
+            )
+        else:
+            data_schema = _EMPTY_SCHEMA
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(schema_dict),
+            data_schema=data_schema,
             description_placeholders={
                 "manual_mac_example": "AA:BB:CC:DD:EE:FF"
             }
@@ -1,12 +1,11 @@
 """Parser for TPMS BLE advertisements."""
 from __future__ import annotations
-from datetime import datetime
+from datetime import UTC, datetime
 
-import re
 import logging
-from struct import unpack
-from dataclasses import dataclass
-from enum import Enum, auto
+import sys
+from collections.abc import Callable
+from struct import Struct
 
 from bluetooth_data_tools import short_address
 from bluetooth_sensor_state_data import BluetoothData
@@ -15,6 +14,40 @@ from sensor_state_data.enum import StrEnum
 
 _LOGGER = logging.getLogger(__name__)
 
+# Interned so list membership tests can hit the identity fast path
+_UUID_TPMS_B = sys.intern("000027a5-0000-1000-8000-00805f9b34fb")
+_UUID_FBB0 = sys.intern("0000fbb0-0000-1000-8000-00805f9b34fb")
+
+# Type A payload from byte 6: pressure, temperature, battery, alarm
+_TPMS_A_STRUCT = Struct("=iib?")
+
+# Type B payload: signed temperature, big-endian pressure
+_TPMS_B_STRUCT = Struct(">bH")
+
+# TomTom fixed fields from byte 2: sensor number, address prefix (skipped),
+# sensor address, pressure (skipped), temperature, padding, battery, alarm
+_TOMTOM_STRUCT = Struct("<B2x3s4xH2xBB")
+
+# TomTom pressure layout (start byte, endian, divisor) per sensor position
+_TOMTOM_PRESSURE_CFG = {
+    # Sensor 1: bytes 9-10 (big), divisor 140 → ±0.012 bar
+    1: (9, "big", 140),
+    # Sensor 2: bytes 8-9 (little), divisor 145 → ±0.001 bar
+    2: (8, "little", 145),
+    # Sensor 3: bytes 8-9 (little), divisor 150 → ±0.108 bar
+    3: (8, "little", 150),
+    # Sensor 4: bytes 11-12 (little), divisor 140
+    4: (11, "little", 140),
+}
+# Original layout for any other sensor position: bytes 8-9 (big), kPa * 100
+_TOMTOM_PRESSURE_DEFAULT = (8, "big", 100)
+_TOMTOM_PRESSURE_STRUCT = {"big": Struct(">H"), "little": Struct("<H")}
+
+# Type B battery percentage is linear between these voltages
+_BATTERY_MIN_VOLTAGE = 2.6
+_BATTERY_MAX_VOLTAGE = 3.3
+_BATTERY_SCALE = 100.0 / (_BATTERY_MAX_VOLTAGE - _BATTERY_MIN_VOLTAGE)
+
 
 class TPMSSensor(StrEnum):
 
@@ -29,62 +62,102 @@ class TPMSBinarySensor(StrEnum):
     ALARM = "alarm"
 
 
+_KEY_PRESSURE = str(TPMSSensor.PRESSURE)
+_KEY_TEMPERATURE = str(TPMSSensor.TEMPERATURE)
+_KEY_BATTERY = str(TPMSSensor.BATTERY)
+_KEY_TIMESTAMP = str(TPMSSensor.TIMESTAMP)
+_KEY_ALARM = str(TPMSBinarySensor.ALARM)
+
+
 class TPMSBluetoothDeviceData(BluetoothData):
     """Data for TPMS BLE sensors."""
-    
-    def supported(self, service_info) -> bool:
+
+    def __init__(self) -> None:
+        """Initialize the TPMS data."""
+        super().__init__()
+        # Last (pressure, battery, temperature, alarm) pushed per address
+        self._last_values: dict[str, tuple[float, int, float, bool | None]] = {}
+        # Addresses whose device info has already been set
+        self._named_addresses: set[str] = set()
+        # (company_id == 256, FBB0 UUID present, 27A5 UUID present) -> parser
+        self._dispatch: dict[tuple[bool, bool, bool], Callable[[str, str, bytes, int], None]] = {
+            # TomTom TPMS with FBB0 service UUID and manufacturer ID 256 (0x0100)
+            (True, True, False): self._process_tpms_tomtom,
+            (True, False, False): self._process_tpms_a,
+            # Type B is identified by its service UUID alone
+            (True, True, True): self._process_tpms_b,
+            (True, False, True): self._process_tpms_b,
+            (False, True, True): self._process_tpms_b,
+            (False, False, True): self._process_tpms_b,
+        }
+
+    def supported(self, service_info: BluetoothServiceInfo) -> bool:
         """Check if device is a supported TPMS sensor."""
         manufacturer_data = service_info.manufacturer_data
-        service_uuids = service_info.service_uuids
-        
-        # TomTom TPMS with FBB0 service UUID and manufacturer ID 256
-        if "0000fbb0-0000-1000-8000-00805f9b34fb" in service_uuids:
-            if manufacturer_data and 256 in manufacturer_data:
+
+        # Every supported type carries manufacturer data, check the cheap dict lookup first
+        if manufacturer_data:
+            service_uuids = service_info.service_uuids
+            has_256 = 256 in manufacturer_data
+
+            # TomTom TPMS with FBB0 service UUID and manufacturer ID 256
+            if has_256 and _UUID_FBB0 in service_uuids:
                 _LOGGER.debug("TomTom TPMS detected by FBB0 service UUID + manufacturer 256: %s", service_info.address)
                 return True
-                
-        # Type B (service UUID based)
-        if "000027a5-0000-1000-8000-00805f9b34fb" in service_uuids:
-            _LOGGER.debug("TPMS Type B detected by service UUID: %s", service_info.address)
-            return True
-            
-        # Type A (manufacturer ID 256 based, without FBB0)
-        if manufacturer_data and 256 in manufacturer_data:
-            _LOGGER.debug("TPMS Type A detected by manufacturer ID 256: %s", service_info.address)
-            return True
-        
-        _LOGGER.debug("Device not recognized as supported TPMS: %s (name: %s, manufacturer_data: %s, service_uuids: %s)", 
-                     service_info.address, service_info.name, 
-                     list(manufacturer_data.keys()) if manufacturer_data else "None",
-                     list(service_uuids))
+
+            # Type B (service UUID based)
+            if _UUID_TPMS_B in service_uuids:
+                _LOGGER.debug("TPMS Type B detected by service UUID: %s", service_info.address)
+                return True
+
+            # Type A (manufacturer ID 256 based, without FBB0)
+            if has_256:
+                _LOGGER.debug("TPMS Type A detected by manufacturer ID 256: %s", service_info.address)
+                return True
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Device not recognized as supported TPMS: %s (name: %s, manufacturer_data: %s, service_uuids: %s)",
+                         service_info.address, service_info.name,
+                         list(manufacturer_data) if manufacturer_data else "None",
+                         list(service_info.service_uuids))
         return False
 
     def _start_update(self, service_info: BluetoothServiceInfo) -> None:
         """Update from BLE advertisement data."""
-        _LOGGER.debug("Parsing TPMS BLE advertisement data: %s", service_info)
+        # Every supported type carries manufacturer data, bail out before any other work
         manufacturer_data = service_info.manufacturer_data
+        if not manufacturer_data:
+            return None
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Parsing TPMS BLE advertisement data: %s", service_info)
         local_name = service_info.name
         address = service_info.address
-        if len(manufacturer_data) == 0:
-            return None
 
-        company_id, mfr_data = next(iter(manufacturer_data.items()))
-        self.set_device_manufacturer("TPMS")
+        service_uuids = service_info.service_uuids
+        has_tpms_b = _UUID_TPMS_B in service_uuids
 
-        if "000027a5-0000-1000-8000-00805f9b34fb" in service_info.service_uuids:
-            self._process_tpms_b(address, local_name, mfr_data, company_id)
-        elif company_id == 256 and "0000fbb0-0000-1000-8000-00805f9b34fb" in service_info.service_uuids:
-            # TomTom TPMS with FBB0 service UUID and manufacturer ID 256 (0x0100)
-            self._process_tpms_tomtom(address, local_name, mfr_data, company_id)
-        elif company_id == 256:
-            self._process_tpms_a(address, local_name, mfr_data)
+        # Type B carries its voltage in the first company ID, the other
+        # types are identified by manufacturer ID 256 and can index it directly
+        if not has_tpms_b and 256 in manufacturer_data:
+            company_id = 256
+        else:
+            company_id = next(iter(manufacturer_data))
+        mfr_data = manufacturer_data[company_id]
+
+        handler = self._dispatch.get(
+            (company_id == 256, _UUID_FBB0 in service_uuids, has_tpms_b)
+        )
+        if handler is not None:
+            handler(address, local_name, mfr_data, company_id)
         else:
             _LOGGER.error("Can't find the correct data type for company_id %s, service_uuids: %s", 
-                         company_id, service_info.service_uuids)
+                         company_id, service_uuids)
 
-    def _process_tpms_a(self, address: str, local_name: str, data: bytes) -> None:
+    def _process_tpms_a(self, address: str, local_name: str, data: bytes, company_id: int) -> None:
         """Parser for TPMS sensors."""
-        _LOGGER.debug("Parsing TPMS TypeA sensor: %s", data)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Parsing TPMS TypeA sensor: %s", data)
         msg_length = len(data)
         if msg_length != 16:
             _LOGGER.error("Can't parse the data because the data length should be 16")
@@ -94,33 +167,27 @@ class TPMSBluetoothDeviceData(BluetoothData):
             temperature,
             battery,
             alarm
-        ) = unpack("=iib?", data[6:16])
+        ) = _TPMS_A_STRUCT.unpack_from(data, 6)
         pressure = pressure / 100000
         temperature = temperature / 100
         self._update_sensors(address, pressure, battery, temperature, alarm)
 
     def _process_tpms_b(self, address: str, local_name: str, data: bytes, company_id: int) -> None:
         """Parser for TPMS sensors."""
-        _LOGGER.debug("Parsing TPMS TypeB sensor: (%s) %s", company_id, data)
-        comp_hex = re.findall("..", hex(company_id)[2:].zfill(4))[::-1]
-        comp_hex = "".join(comp_hex)
-        data_hex = data.hex()
-
-        msg_length = len(data_hex)
-        if msg_length != 10:
-            _LOGGER.error("Can't parse the data because the data length should be 10")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Parsing TPMS TypeB sensor: (%s) %s", company_id, data)
+        msg_length = len(data)
+        if msg_length != 5:
+            _LOGGER.error("Can't parse the data because the data length should be 5")
             return
-        voltage = int(comp_hex[2:4], 16) / 10
-        temperature = int(data_hex[0:2], 16)
-        if temperature >= 2 ** 7:
-            temperature -= 2 ** 8
-        psi_pressure = (int(data_hex[2:6], 16) - 145) / 10
+        # Voltage is carried in the high byte of the 16-bit company ID
+        voltage = (company_id >> 8) / 10
+        temperature, pressure_raw = _TPMS_B_STRUCT.unpack_from(data)
+        psi_pressure = (pressure_raw - 145) / 10
 
         pressure = round(psi_pressure * 0.0689476, 3)
-        min_voltage = 2.6
-        max_voltage = 3.3
-        battery = ((voltage - min_voltage) / (max_voltage - min_voltage)) * 100
-        battery = int(round(max(0, min(100, battery)), 0))
+        battery = (voltage - _BATTERY_MIN_VOLTAGE) * _BATTERY_SCALE
+        battery = 0 if battery < 0 else 100 if battery > 100 else int(battery + 0.5)
         self._update_sensors(address, pressure, battery, temperature, None)
 
     def _process_tpms_tomtom(self, address: str, local_name: str, data: bytes, company_id: int) -> None:
@@ -136,121 +203,58 @@ class TPMSBluetoothDeviceData(BluetoothData):
         byte 16:     XX Battery Percentage
         byte 17:     XX Alarm Flag (00: OK, 01: No Pressure)
         """
-        _LOGGER.debug("Parsing TomTom TPMS sensor: %s", data.hex())
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Parsing TomTom TPMS sensor: %s", data.hex())
         msg_length = len(data)
         if msg_length != 18:
             _LOGGER.error("TomTom TPMS data length should be 18, got %d", msg_length)
             return
             
         try:
-            # Extract sensor number for identification
-            sensor_number = data[2]
+            # Extract all fixed-offset fields in one pass
+            (
+                sensor_number,
+                sensor_addr_raw,
+                temp_raw,
+                battery,
+                alarm_flag,
+            ) = _TOMTOM_STRUCT.unpack_from(data, 2)
+
+            # Sensor number for identification
             sensor_id = sensor_number - 0x80 + 1  # 0x80=1, 0x81=2, etc.
             
-            # Extract sensor address (bytes 5-7)
-            sensor_addr = data[5:8].hex().upper()
-            
-            # Extract pressure - intelligent auto-detection with known optimal configurations
-            # First try known optimal configurations for specific sensor positions
-            sensor_id = sensor_number - 0x80 + 1
-            known_configs = [
-                # Sensor 1: bytes 9-10 (big), divisor 140 → ±0.012 bar
-                (9, 'big', 140) if sensor_id == 1 else None,
-                # Sensor 2: bytes 8-9 (little), divisor 145 → ±0.001 bar  
-                (8, 'little', 145) if sensor_id == 2 else None,
-                # Sensor 3: bytes 8-9 (little), divisor 150 → ±0.108 bar
-                (8, 'little', 150) if sensor_id == 3 else None,
-                # Sensor 4: bytes 11-12 (little), divisor 140
-                (11, 'little', 140) if sensor_id == 4 else None,
-            ]
-            
-            best_pressure = None
-            best_config = None
-            best_diff = float('inf')
-            
-            # First try known optimal configuration for this sensor
-            for config in known_configs:
-                if config is not None:
-                    start_byte, endian, divisor = config
-                    try:
-                        raw_value = int.from_bytes(data[start_byte:start_byte+2], byteorder=endian)
-                        pressure_bar = (raw_value / divisor) / 100
-                        
-                        if 1.5 <= pressure_bar <= 7.0:  # Realistic range
-                            best_pressure = pressure_bar
-                            best_config = {
-                                'start_byte': start_byte,
-                                'endian': endian,
-                                'divisor': divisor,
-                                'raw_value': raw_value,
-                                'pressure_kpa': raw_value / divisor
-                            }
-                            break  # Use known optimal configuration
-                    except:
-                        continue
+            # Extract pressure using the known layout for this sensor position
+            start_byte, endian, divisor = _TOMTOM_PRESSURE_CFG.get(sensor_id, _TOMTOM_PRESSURE_DEFAULT)
+            pressure_raw = _TOMTOM_PRESSURE_STRUCT[endian].unpack_from(data, start_byte)[0]
+            pressure_kpa = pressure_raw / divisor
+            pressure_bar = pressure_kpa / 100
             
-            # If no known config worked, try auto-detection
-            if best_config is None:
-                # Test different byte positions, endian formats, and divisors
-                for start_byte in range(6, 16):
-                    if start_byte + 2 > len(data):
-                        continue
-                        
-                    for endian in ['big', 'little']:
-                        for divisor in [100, 110, 120, 130, 140, 150]:
-                            try:
-                                raw_value = int.from_bytes(data[start_byte:start_byte+2], byteorder=endian)
-                                pressure_bar = (raw_value / divisor) / 100
-                                
-                                # Check if pressure is in realistic range (1.5-7.0 bar)
-                                if 1.5 <= pressure_bar <= 7.0:
-                                    # Simple scoring: prefer typical tire pressure range (2.0-5.0 bar)
-                                    if 2.0 <= pressure_bar <= 5.0:
-                                        score = 1.0  # Good pressure
-                                    else:
-                                        score = 0.5  # Acceptable pressure
-                                        
-                                    diff = 1.0 - score
-                                    
-                                    if diff < best_diff:
-                                        best_diff = diff
-                                        best_pressure = pressure_bar
-                                        best_config = {
-                                            'start_byte': start_byte,
-                                            'endian': endian,
-                                            'divisor': divisor,
-                                            'raw_value': raw_value,
-                                            'pressure_kpa': raw_value / divisor
-                                        }
-                            except:
-                                continue
-            
-            # Use best configuration found, or fallback
-            if best_config:
-                pressure_bar = best_pressure
-                pressure_kpa = best_config['pressure_kpa']
-                pressure_raw = best_config['raw_value']
-                endian_used = f"{best_config['endian']} (bytes {best_config['start_byte']}-{best_config['start_byte']+1}, div {best_config['divisor']})"
-            else:
-                # Fallback to original method
-                pressure_raw = int.from_bytes(data[8:10], byteorder='big')
-                pressure_kpa = pressure_raw / 100
-                pressure_bar = pressure_kpa / 100
-                endian_used = "big (fallback)"
-            
-            # Extract temperature (bytes 12-13, LITTLE-endian, in Celsius/100)
-            temp_raw = int.from_bytes(data[12:14], byteorder='little', signed=False)
+            # Temperature (bytes 12-13, LITTLE-endian, in Celsius/100)
             temperature = temp_raw / 100  # Convert to Celsius
             
-            # Extract battery (byte 16)
-            battery = data[16] if data[16] <= 100 else 100
+            # Battery (byte 16)
+            battery = battery if battery <= 100 else 100
             
-            # Extract alarm flag (byte 17)
-            alarm_flag = data[17]
+            # Alarm flag (byte 17)
             alarm = alarm_flag != 0
             
-            _LOGGER.info("TomTom TPMS parsed - Sensor %d (%s): pressure=%.2f bar (%.0f kPa), temp=%.1f°C, battery=%d%%, alarm=%s [pressure: %s-endian]", 
-                        sensor_id, sensor_addr, pressure_bar, pressure_kpa, temperature, battery, alarm, endian_used)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "TomTom TPMS parsed - Sensor %d (%s): pressure=%.2f bar (%.0f kPa), "
+                    "temp=%.1f°C, battery=%d%%, alarm=%s "
+                    "[pressure: %s-endian (bytes %d-%d, div %d)]",
+                    sensor_id,
+                    sensor_addr_raw.hex().upper(),
+                    pressure_bar,
+                    pressure_kpa,
+                    temperature,
+                    battery,
+                    alarm,
+                    endian,
+                    start_byte,
+                    start_byte + 1,
+                    divisor,
+                )
             
             self._update_sensors(address, pressure_bar, battery, temperature, alarm)
             
@@ -259,39 +263,58 @@ class TPMSBluetoothDeviceData(BluetoothData):
             # Fallback: create sensors with zero values to show device exists
             self._update_sensors(address, 0.0, 0, 0, False)
 
-    def _update_sensors(self, address, pressure, battery, temperature, alarm):
-        name = f"TPMS {short_address(address)}"
-        self.set_device_type(name)
-        self.set_device_name(name)
-        self.set_title(name)
+    def _update_sensors(
+        self,
+        address: str,
+        pressure: float,
+        battery: int,
+        temperature: float,
+        alarm: bool | None,
+    ) -> None:
+        # Skip re-dispatching identical readings
+        values = (pressure, battery, temperature, alarm)
+        if self._last_values.get(address) == values:
+            return
+        self._last_values[address] = values
+
+        # Device info never changes for an address, only set it once
+        if address not in self._named_addresses:
+            self._named_addresses.add(address)
+            name = f"TPMS {short_address(address)}"
+            self.set_device_manufacturer("TPMS")
+            self.set_device_type(name)
+            self.set_device_name(name)
+            self.set_title(name)
 
-        self.update_sensor(
-            key=str(TPMSSensor.PRESSURE),
+        # Bind once, the setter is called four times per reading
+        update_sensor = self.update_sensor
+        update_sensor(
+            key=_KEY_PRESSURE,
             native_unit_of_measurement=None,
             native_value=pressure,
             name="Pressure",
         )
-        self.update_sensor(
-            key=str(TPMSSensor.TEMPERATURE),
+        update_sensor(
+            key=_KEY_TEMPERATURE,
             native_unit_of_measurement=None,
             native_value=temperature,
             name="Temperature",
         )
-        self.update_sensor(
-            key=str(TPMSSensor.BATTERY),
+        update_sensor(
+            key=_KEY_BATTERY,
             native_unit_of_measurement=None,
             native_value=battery,
             name="Battery",
         )
         if alarm is not None:
             self.update_binary_sensor(
-                key=str(TPMSBinarySensor.ALARM),
+                key=_KEY_ALARM,
                 native_value=bool(alarm),
                 name="Alarm",
             )
-        self.update_sensor(
-            key=str(TPMSSensor.TIMESTAMP),
+        update_sensor(
+            key=_KEY_TIMESTAMP,
             native_unit_of_measurement=None,
-            native_value=datetime.now().astimezone(),
+            native_value=datetime.now(UTC),
             name="Last Update",
         )